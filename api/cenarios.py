@@ -0,0 +1,158 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+# Campos numéricos que podem variar na simulação de cenários
+CAMPOS_GRADE = ('tamanho_equipe', 'duracao_meses', 'orcamento')
+
+# Fatores aplicados sobre o valor base quando o cliente não envia uma grade
+FATORES_PADRAO = (0.5, 0.75, 1.25, 1.5, 2.0)
+
+# Limites da simulação: valores por grade e total de variações avaliadas
+MAX_VALORES_GRADE = 50
+MAX_VARIACOES = 20_000
+
+
+def grade_padrao(campo, valor_base):
+    """
+    Gera a grade padrão de um campo numérico a partir do valor base,
+    sem repetir o próprio valor base.
+    """
+    valores = np.asarray(valor_base, dtype=float) * np.asarray(FATORES_PADRAO)
+    if campo == 'orcamento':
+        valores = np.round(valores, 2)
+    else:
+        valores = np.maximum(np.rint(valores), 1).astype(int)
+    valores = np.unique(valores)
+    return valores[(valores != valor_base) & (valores > 0)].tolist()
+
+
+def _eixo(valor_base, grade):
+    """
+    Valores de um campo numérico na simulação: o valor base primeiro,
+    seguido da grade sem repetições.
+    """
+    return list(dict.fromkeys([valor_base] + list(grade or [])))
+
+
+def contar_variacoes(base, grades, categorias, combinar_numericos=True):
+    """
+    Número de linhas que montar_variacoes vai gerar (projeto base incluído),
+    calculado sem montar as combinações.
+    """
+    tamanhos = [len(_eixo(base[campo], grades.get(campo))) for campo in CAMPOS_GRADE]
+    simples = sum(tamanho - 1 for tamanho in tamanhos)
+    simples += sum(sum(1 for valor in valores if valor != base[campo]) for campo, valores in categorias.items())
+    combinadas = 0
+    if combinar_numericos:
+        combinadas = int(np.prod(tamanhos)) - 1 - sum(tamanho - 1 for tamanho in tamanhos)
+    return 1 + simples + combinadas
+
+
+def montar_solicitadas(base, grades, cenarios, categorias):
+    """
+    Lista os cenários pedidos explicitamente pelo cliente, na ordem em que
+    vieram e sem repetições: um por valor das grades enviadas e um por item
+    de `cenarios` (campo -> novo valor). Valores categóricos precisam ser
+    categorias conhecidas pelo modelo; levanta ValueError caso contrário.
+    """
+    solicitadas = [{campo: valor} for campo in CAMPOS_GRADE for valor in grades.get(campo) or []]
+
+    for cenario in cenarios or []:
+        if not cenario:
+            raise ValueError("Cada cenário deve alterar ao menos um campo.")
+        mudanca = {}
+        for campo, valor in cenario.items():
+            if campo in CAMPOS_GRADE:
+                if isinstance(valor, (str, bool)) or not valor > 0:
+                    raise ValueError(f"Valor inválido para '{campo}': {valor!r}.")
+                if campo != 'orcamento':
+                    if valor != int(valor):
+                        raise ValueError(f"O campo '{campo}' aceita apenas números inteiros.")
+                    valor = int(valor)
+            elif campo in categorias:
+                if valor not in categorias[campo]:
+                    raise ValueError(
+                        f"Valor desconhecido para '{campo}': {valor!r}. Opções: {list(categorias[campo])}."
+                    )
+            else:
+                raise ValueError(f"O campo '{campo}' não pode ser simulado.")
+            mudanca[campo] = valor
+        solicitadas.append(mudanca)
+
+    return list({tuple(sorted(mudanca.items())): mudanca for mudanca in solicitadas}.values())
+
+
+def montar_variacoes(base, grades, categorias, combinar_numericos=True, solicitadas=()):
+    """
+    Monta todas as variações do projeto base em um único DataFrame.
+
+    - Para cada campo numérico da grade, um cenário por valor.
+    - Para cada campo categórico, um cenário por categoria conhecida pelo modelo.
+    - Se combinar_numericos, também o produto cartesiano das grades numéricas.
+
+    - Por fim, os cenários `solicitadas` (de montar_solicitadas) que ainda
+      não estejam entre os anteriores.
+
+    A primeira linha é sempre o projeto base. Retorna o DataFrame, a lista
+    de mudanças (campo -> novo valor) de cada linha e a linha de cada cenário
+    solicitado. Levanta ValueError se o total passar de MAX_VARIACOES.
+    """
+    total = contar_variacoes(base, grades, categorias, combinar_numericos) + len(solicitadas)
+    if total - 1 > MAX_VARIACOES:
+        raise ValueError(
+            f"A simulação geraria {total - 1} variações; o limite é {MAX_VARIACOES}. "
+            "Reduza as grades ou desligue combinar_numericos."
+        )
+
+    eixos = [(campo, _eixo(base[campo], grades.get(campo))) for campo in CAMPOS_GRADE]
+    mudancas = [{}]
+
+    for campo, valores in eixos:
+        for valor in valores[1:]:
+            mudancas.append({campo: valor})
+
+    for campo, valores in categorias.items():
+        for valor in valores:
+            if valor != base[campo]:
+                mudancas.append({campo: valor})
+
+    if combinar_numericos:
+        for combinacao in itertools.product(*(valores for _, valores in eixos)):
+            mudanca = {
+                campo: valor
+                for (campo, _), valor in zip(eixos, combinacao)
+                if valor != base[campo]
+            }
+            # Cenários com um único campo alterado já foram gerados acima
+            if len(mudanca) > 1:
+                mudancas.append(mudanca)
+
+    linhas = {tuple(sorted(mudanca.items())): i for i, mudanca in enumerate(mudancas)}
+    linhas_solicitadas = []
+    for mudanca in solicitadas:
+        chave = tuple(sorted((campo, valor) for campo, valor in mudanca.items() if valor != base[campo]))
+        if chave not in linhas:
+            linhas[chave] = len(mudancas)
+            mudancas.append(mudanca)
+        linhas_solicitadas.append(linhas[chave])
+
+    # Replica o projeto base em arrays e aplica só os campos alterados em cada cenário
+    colunas = {campo: np.repeat(np.asarray([valor], dtype=object if isinstance(valor, str) else None), len(mudancas))
+               for campo, valor in base.items()}
+    for i, mudanca in enumerate(mudancas):
+        for campo, valor in mudanca.items():
+            colunas[campo][i] = valor
+
+    return pd.DataFrame(colunas, copy=False), mudancas, linhas_solicitadas
+
+
+def ranquear_variacoes(probabilidades, mudancas, top_n):
+    """
+    Ordena as variações pelo ganho de probabilidade em relação ao projeto base
+    (primeira linha) e retorna apenas as que aumentam a chance de sucesso.
+    """
+    ganhos = probabilidades - probabilidades[0]
+    ordem = np.argsort(-ganhos[1:], kind='stable') + 1
+    melhores = [i for i in ordem if ganhos[i] > 0][:top_n]
+    return [(mudancas[i], float(probabilidades[i]), float(ganhos[i])) for i in melhores]
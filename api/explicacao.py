@@ -0,0 +1,127 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from scipy import sparse
+
+
+def versao_modelo(path):
+    """
+    Identifica a versão do modelo pelo hash do arquivo .pkl.
+    Muda sempre que o modelo é retreinado.
+    """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()[:12]
+
+
+class ExplicadorFloresta:
+    """
+    Calcula a contribuição de cada campo de entrada para a probabilidade de
+    sucesso prevista pelo Random Forest, por decomposição dos caminhos nas árvores.
+
+    Em cada árvore, a variação da probabilidade entre um nó e seu filho é
+    atribuída à variável usada no split. Somando ao longo do caminho até a
+    folha, a previsão fica: valor_base + soma das contribuições.
+
+    As variações de todos os nós de todas as árvores são pré-calculadas uma
+    única vez em uma matriz esparsa (nós x campos originais), já agregando as
+    colunas one-hot de volta aos 13 campos. Explicar um lote é então uma
+    multiplicação entre os caminhos percorridos (decision_path) e essa matriz.
+    """
+
+    def __init__(self, pipeline, versao, tamanho_cache=1024):
+        self.pre = pipeline.named_steps['pre']
+        self.clf = pipeline.named_steps['clf']
+        self.versao = versao
+        self.tamanho_cache = tamanho_cache
+        self._cache = OrderedDict()
+
+        self.campos, mapa = self._mapear_colunas()
+
+        variacoes, raizes = [], []
+        for arvore in self.clf.estimators_:
+            delta, raiz = self._variacoes_arvore(arvore.tree_)
+            variacoes.append(delta)
+            raizes.append(raiz)
+
+        # Nós de todas as árvores empilhados na mesma ordem de colunas do decision_path
+        n_arvores = len(self.clf.estimators_)
+        self._contrib_por_no = (sparse.vstack(variacoes).tocsr() @ mapa).tocsr() / n_arvores
+        self.valor_base = float(np.mean(raizes))
+
+    def _mapear_colunas(self):
+        """
+        Monta a matriz que soma as colunas transformadas (escaladas e one-hot)
+        de volta ao campo original de onde cada uma veio.
+        """
+        campos, linhas = [], []
+        for nome, transformador, colunas in self.pre.transformers_:
+            if nome == 'remainder' or transformador == 'drop':
+                continue
+            if hasattr(transformador, 'categories_'):
+                drop_idx = getattr(transformador, 'drop_idx_', None)
+                larguras = [
+                    len(cats) - (drop_idx is not None and drop_idx[i] is not None)
+                    for i, cats in enumerate(transformador.categories_)
+                ]
+            else:
+                larguras = [1] * len(colunas)
+            for campo, largura in zip(colunas, larguras):
+                linhas.extend([len(campos)] * largura)
+                campos.append(campo)
+
+        n_colunas = max(fatia.stop for fatia in self.pre.output_indices_.values())
+        mapa = sparse.csr_matrix(
+            (np.ones(len(linhas)), (np.arange(len(linhas)), linhas)),
+            shape=(n_colunas, len(campos)),
+        )
+        return campos, mapa
+
+    @staticmethod
+    def _variacoes_arvore(tree):
+        """
+        Para uma árvore, retorna a matriz esparsa (nós x colunas transformadas)
+        com a variação da probabilidade de sucesso em cada nó em relação ao pai,
+        atribuída à coluna usada no split do pai, e a probabilidade da raiz.
+        """
+        valores = tree.value[:, 0, :]
+        prob = valores[:, 1] / valores.sum(axis=1)
+
+        pais = np.arange(tree.node_count)
+        internos = tree.children_left >= 0
+        filhos = np.concatenate([tree.children_left[internos], tree.children_right[internos]])
+        origem = np.concatenate([pais[internos], pais[internos]])
+
+        delta = sparse.csr_matrix(
+            (prob[filhos] - prob[origem], (filhos, tree.feature[origem])),
+            shape=(tree.node_count, tree.n_features),
+        )
+        return delta, prob[0]
+
+    def explicar(self, df):
+        """
+        Retorna a matriz (linhas x campos) de contribuições de um lote.
+        """
+        X = self.pre.transform(df)
+        caminhos, _ = self.clf.decision_path(X)
+        return np.asarray((caminhos @ self._contrib_por_no).todense())
+
+    def explicar_registro(self, registro, df):
+        """
+        Explica um único projeto, com cache por versão do modelo e valores de entrada.
+        Retorna um dicionário campo -> contribuição.
+        """
+        chave = (self.versao, tuple(registro[campo] for campo in self.campos))
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            return self._cache[chave]
+
+        contrib = self.explicar(df)[0]
+        resultado = {campo: round(float(c), 4) for campo, c in zip(self.campos, contrib)}
+
+        self._cache[chave] = resultado
+        if len(self._cache) > self.tamanho_cache:
+            self._cache.popitem(last=False)
+        return resultado
@@ -0,0 +1,168 @@
+import json
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException, Response
+
+# Backends opcionais: orjson acelera o JSON e msgpack habilita o formato binário.
+# Sem eles a API continua funcionando com o json da biblioteca padrão.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Tipos de mídia aceitos na negociação de conteúdo
+MEDIA_JSON = "application/json"
+MEDIA_MSGPACK = "application/msgpack"
+MEDIA_MSGPACK_ALIASES = {
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+}
+
+
+def tipo_midia(header):
+    """
+    Extrai o tipo de mídia de um header Content-Type/Accept,
+    descartando parâmetros como charset e q.
+    """
+    if not header:
+        return ""
+    return header.split(";", 1)[0].strip().lower()
+
+
+def _para_nativo(obj):
+    """
+    Converte tipos NumPy em tipos nativos do Python para os serializadores
+    que não os entendem diretamente.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+
+def decodificar_corpo(body, content_type):
+    """
+    Decodifica o corpo da requisição de acordo com o Content-Type.
+    JSON é o padrão quando o header não é enviado.
+    """
+    midia = tipo_midia(content_type)
+
+    if midia in MEDIA_MSGPACK_ALIASES:
+        if msgpack is None:
+            raise HTTPException(status_code=415, detail="MessagePack não está disponível no servidor.")
+        try:
+            return msgpack.unpackb(body, raw=False)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Corpo MessagePack inválido.")
+
+    if midia in ("", MEDIA_JSON) or midia.endswith("+json"):
+        try:
+            return orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Corpo JSON inválido.")
+
+    raise HTTPException(status_code=415, detail=f"Content-Type não suportado: {midia}")
+
+
+def escolher_formato(accept):
+    """
+    Escolhe o formato da resposta a partir do header Accept.
+    Respeita a ordem em que os tipos foram listados pelo cliente.
+    """
+    if accept:
+        for parte in accept.split(","):
+            midia = tipo_midia(parte)
+            if midia in MEDIA_MSGPACK_ALIASES and msgpack is not None:
+                return MEDIA_MSGPACK
+            if midia in (MEDIA_JSON, "*/*", "application/*"):
+                return MEDIA_JSON
+    return MEDIA_JSON
+
+
+def codificar_resposta(dados, accept, status_code=200):
+    """
+    Serializa a resposta no formato negociado (JSON rápido ou MessagePack).
+    Arrays NumPy são aceitos diretamente, sem conversão linha a linha.
+    """
+    formato = escolher_formato(accept)
+
+    if formato == MEDIA_MSGPACK:
+        conteudo = msgpack.packb(dados, default=_para_nativo, use_bin_type=True)
+    elif orjson is not None:
+        conteudo = orjson.dumps(dados, default=_para_nativo, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        conteudo = json.dumps(dados, default=_para_nativo, ensure_ascii=False).encode("utf-8")
+
+    return Response(content=conteudo, media_type=formato, status_code=status_code)
+
+
+def lote_para_dataframe(dados, tipos):
+    """
+    Converte um lote de projetos em DataFrame, com um array NumPy por campo
+    de `tipos` presente no lote. Campos ausentes ficam de fora; quem monta
+    as features do modelo é que decide se eles são obrigatórios.
+
+    Aceita dois formatos:
+    - Colunar: {"campo": [v1, v2, ...], ...}, convertido direto em arrays NumPy,
+      sem construir um objeto por linha.
+    - Lista de objetos: [{"campo": v1, ...}, ...] (ou {"projetos": [...]}).
+    """
+    if isinstance(dados, dict) and isinstance(dados.get("projetos"), list):
+        dados = dados["projetos"]
+
+    if isinstance(dados, list):
+        if not all(isinstance(registro, dict) for registro in dados):
+            raise HTTPException(status_code=422, detail="Formato de lote não reconhecido.")
+        df = pd.DataFrame.from_records(dados)
+        campos = [campo for campo in tipos if campo in df.columns]
+        if df[campos].isna().any().any():
+            faltantes = [campo for campo in campos if df[campo].isna().any()]
+            raise HTTPException(status_code=422, detail=f"Campos ausentes no lote: {faltantes}")
+        colunas = {campo: df[campo].to_numpy() for campo in campos}
+    elif isinstance(dados, dict):
+        colunas = dados
+    else:
+        raise HTTPException(status_code=422, detail="Formato de lote não reconhecido.")
+
+    arrays = {}
+    tamanho = None
+    for campo, tipo in tipos.items():
+        if campo not in colunas:
+            continue
+        tipo = np.dtype(tipo)
+        try:
+            # Inteiros passam por float para que 8.7 seja rejeitado em vez de truncado
+            valores = np.asarray(colunas[campo], dtype=float if tipo.kind in "iu" else tipo)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail=f"Valores inválidos para o campo '{campo}'.")
+        if valores.ndim != 1:
+            raise HTTPException(status_code=422, detail=f"O campo '{campo}' deve ser uma lista de valores.")
+        if pd.isna(valores).any():
+            raise HTTPException(status_code=422, detail=f"Campos ausentes no lote: ['{campo}']")
+        if tipo.kind in "iu":
+            if not np.array_equal(valores, np.trunc(valores)):
+                raise HTTPException(status_code=422, detail=f"O campo '{campo}' aceita apenas números inteiros.")
+            # Em float, o máximo do inteiro arredonda para o primeiro valor fora do intervalo (2**63)
+            limites = np.iinfo(tipo)
+            if ((valores < limites.min) | (valores >= float(limites.max))).any():
+                raise HTTPException(status_code=422, detail=f"Valores fora do intervalo para o campo '{campo}'.")
+            valores = valores.astype(tipo)
+        if tamanho is None:
+            tamanho = len(valores)
+        elif len(valores) != tamanho:
+            raise HTTPException(status_code=422, detail="Todas as colunas do lote devem ter o mesmo tamanho.")
+        arrays[campo] = valores
+
+    if tamanho is None:
+        raise HTTPException(status_code=422, detail="Nenhum campo reconhecido no lote.")
+    if tamanho == 0:
+        raise HTTPException(status_code=422, detail="O lote está vazio.")
+
+    return pd.DataFrame(arrays, copy=False)
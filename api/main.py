@@ -1,28 +1,54 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError, confloat, conint
+from typing import Dict, List, Optional, Union
 import joblib
+import numpy as np
 import pandas as pd
 from contextlib import asynccontextmanager
 import uvicorn
+from api.formatos import (
+    MEDIA_JSON,
+    MEDIA_MSGPACK,
+    codificar_resposta,
+    decodificar_corpo,
+    lote_para_dataframe,
+    tipo_midia,
+)
+from api.cenarios import (
+    CAMPOS_GRADE,
+    MAX_VALORES_GRADE,
+    grade_padrao,
+    montar_solicitadas,
+    montar_variacoes,
+    ranquear_variacoes,
+)
+from api.explicacao import ExplicadorFloresta, versao_modelo
+from ml_model.features import FEATURES, RAW_FEATURES, build_feature_frame, record_features
 
 # Variáveis globais
 model = None
 threshold = None  # Threshold de corte para classificar sucesso ou fracasso
+categorias = None  # Categorias conhecidas pelo modelo para cada campo categórico
+explicador = None  # Decomposição das previsões em contribuições por campo
 
 # Esquema de entrada da API
 class ProjetoRequest(BaseModel):
     """
     Estrutura de dados que define os campos obrigatórios
     que o cliente deve enviar para realizar a previsão.
+    A data pode vir como data_inicio ('AAAA-MM-DD' ou 'DD/MM/AAAA'),
+    da qual ano, mês e dia da semana são derivados como no treinamento,
+    ou já decomposta em ano_inicio, mes_inicio e dia_semana (0 = segunda).
     """
     duracao_meses: int
     orcamento: float
     entregas: int
     tamanho_equipe: int
     recursos_disponiveis: int
-    ano_inicio: int
-    mes_inicio: int
-    dia_semana: int
+    data_inicio: Optional[str] = None
+    ano_inicio: Optional[int] = None
+    mes_inicio: Optional[int] = None
+    dia_semana: Optional[int] = None
     tipo_projeto: str
     departamento: str
     complexidade: str
@@ -33,21 +59,115 @@ class ProjetoRequest(BaseModel):
 class ProjetoResponse(BaseModel):
     """
     Estrutura de resposta que será retornada.
-    Inclui a probabilidade de sucesso e a classificação final.
+    Inclui a probabilidade de sucesso e a classificação final e, quando
+    solicitado, a contribuição de cada campo para a probabilidade.
+    """
+    probabilidade_sucesso: float
+    sucesso: bool
+    valor_base: Optional[float] = None
+    contribuicoes: Optional[Dict[str, float]] = None
+
+# Esquema de entrada da simulação de cenários
+class WhatIfRequest(BaseModel):
+    """
+    Projeto base e variações a simular. Cada grade aceita até
+    MAX_VALORES_GRADE valores positivos, e `cenarios` traz combinações
+    específicas (campo -> novo valor), como {"metodologia": "Scrum"}.
+
+    Sem grades nem cenários, a simulação explora tudo: grades padrão a partir
+    do valor base, todas as categorias e as combinações numéricas. Quando o
+    cliente envia valores, só eles são avaliados, a menos que
+    completar_grades, variar_categoricos ou combinar_numericos sejam ligados.
+    """
+    projeto: ProjetoRequest
+    tamanho_equipe: Optional[List[conint(gt=0)]] = Field(default=None, max_length=MAX_VALORES_GRADE)
+    duracao_meses: Optional[List[conint(gt=0)]] = Field(default=None, max_length=MAX_VALORES_GRADE)
+    orcamento: Optional[List[confloat(gt=0)]] = Field(default=None, max_length=MAX_VALORES_GRADE)
+    cenarios: Optional[List[Dict[str, Union[int, float, str]]]] = Field(default=None, max_length=MAX_VALORES_GRADE)
+    completar_grades: Optional[bool] = None
+    variar_categoricos: Optional[bool] = None
+    combinar_numericos: Optional[bool] = None
+    top_n: int = Field(default=10, ge=1, le=100)
+
+# Uma linha do ranking de cenários
+class VariacaoResponse(BaseModel):
+    """
+    Campos alterados em relação ao projeto base e o efeito na previsão.
+    O ganho é negativo quando a mudança reduz a probabilidade de sucesso.
     """
+    mudancas: Dict[str, Union[int, float, str]]
     probabilidade_sucesso: float
+    ganho: float
     sucesso: bool
 
+# Esquema de resposta da simulação de cenários
+class WhatIfResponse(BaseModel):
+    """
+    Previsão do projeto base, o resultado de cada cenário pedido pelo
+    cliente (com ganho ou perda) e as variações que mais aumentam
+    a probabilidade de sucesso, da maior para a menor.
+    """
+    probabilidade_base: float
+    sucesso_base: bool
+    variacoes_avaliadas: int
+    solicitadas: List[VariacaoResponse] = []
+    melhores: List[VariacaoResponse]
+
+# Tipo NumPy de cada campo aceito nos lotes, derivado do esquema de entrada
+def _dtype_campo(campo):
+    for tipo in (int, float):
+        if campo.annotation in (tipo, Optional[tipo]):
+            return np.dtype(tipo)
+    return object
+
+LOTE_DTYPES = {
+    nome: _dtype_campo(ProjetoRequest.model_fields[nome])
+    for nome in FEATURES + ['data_inicio']
+}
+
+# Documenta no OpenAPI os formatos aceitos no corpo das rotas com negociação de conteúdo
+def _corpo_openapi(schema):
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                MEDIA_JSON: {"schema": schema},
+                MEDIA_MSGPACK: {"schema": schema},
+            },
+        }
+    }
+
+_SCHEMA_LOTE_COLUNAR = {
+    "type": "object",
+    "description": (
+        "Formato colunar: uma lista de valores por campo (também aceita uma lista de objetos). "
+        "Envie data_inicio ou as colunas ano_inicio, mes_inicio e dia_semana."
+    ),
+    "properties": {
+        nome: {"type": "array", "items": schema}
+        for nome, schema in ProjetoRequest.model_json_schema()["properties"].items()
+    },
+    "required": [nome for nome in RAW_FEATURES if nome != 'data_inicio'],
+}
+
 # Função de carregamento do modelo
 def load_model():
     """
     Carrega o pipeline Random Forest treinado e o threshold salvo
     do arquivo .pkl
     """
-    global model, threshold
-    bundle = joblib.load('ml_model/model.pkl')
+    global model, threshold, categorias, explicador
+    model_path = 'ml_model/model.pkl'
+    bundle = joblib.load(model_path)
     model = bundle['model']
     threshold = bundle['threshold']
+
+    # Lê do OneHotEncoder as categorias vistas no treino, usadas na simulação de cenários
+    _, encoder, campos = next(t for t in model.named_steps['pre'].transformers_ if t[0] == 'cat')
+    categorias = {campo: cats.tolist() for campo, cats in zip(campos, encoder.categories_)}
+
+    # Pré-calcula as contribuições por nó das árvores; o cache é atrelado à versão do modelo
+    explicador = ExplicadorFloresta(model, versao_modelo(model_path))
     print(f"Modelo carregado. Threshold: {threshold:.2f}")
 
 # Lifespan Event para inicialização
@@ -82,20 +202,46 @@ async def health_check():
     """
     Endpoint para verificar se o modelo foi carregado corretamente.
     """
-    return {"status": "healthy", "model_loaded": model is not None}
+    return {
+        "status": "healthy",
+        "model_loaded": model is not None,
+        "model_version": explicador.versao if explicador is not None else None,
+    }
 
 # Rota principal de previsão
-@app.post("/predict", response_model=ProjetoResponse)
-async def predict(projeto: ProjetoRequest):
+@app.post("/predict", response_model=ProjetoResponse,
+          openapi_extra=_corpo_openapi(ProjetoRequest.model_json_schema()))
+async def predict(request: Request, explain: bool = False):
     """
     Recebe os dados do projeto, faz a previsão da probabilidade de sucesso
     e aplica o threshold salvo para classificar como sucesso ou fracasso.
+    Aceita e responde em JSON ou MessagePack, conforme Content-Type e Accept.
+    Com explain=true, inclui a contribuição de cada campo para a probabilidade.
     """
     if model is None or threshold is None:
         raise HTTPException(status_code=500, detail="Modelo não carregado.")
 
-    # Monta DataFrame com as features de entrada
-    df = pd.DataFrame([projeto.model_dump()])
+    body = await request.body()
+    try:
+        if tipo_midia(request.headers.get("content-type")) in ("", MEDIA_JSON):
+            # Validação direto dos bytes, sem dicionário intermediário
+            projeto = ProjetoRequest.model_validate_json(body)
+        else:
+            projeto = ProjetoRequest.model_validate(
+                decodificar_corpo(body, request.headers.get("content-type"))
+            )
+    except ValidationError as e:
+        erros = e.errors(include_url=False, include_context=False, include_input=False)
+        if any(erro["type"] == "json_invalid" for erro in erros):
+            raise HTTPException(status_code=400, detail="Corpo JSON inválido.")
+        raise HTTPException(status_code=422, detail=erros)
+
+    # Monta as features de entrada (sem pandas até o DataFrame de uma linha)
+    try:
+        registro = record_features(projeto.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    df = pd.DataFrame([registro], columns=FEATURES)
 
     # Calcula probabilidade de sucesso (classe positiva)
     proba = model.predict_proba(df)[0][1]
@@ -103,9 +249,114 @@ async def predict(projeto: ProjetoRequest):
     # Classifica como sucesso ou fracasso com base no threshold
     sucesso = proba >= threshold
 
-    return ProjetoResponse(
+    resposta = ProjetoResponse(
         probabilidade_sucesso=round(float(proba), 4),
-        sucesso=sucesso
+        sucesso=bool(sucesso)
     )
+    if explain:
+        resposta.valor_base = round(explicador.valor_base, 4)
+        resposta.contribuicoes = explicador.explicar_registro(registro, df)
+
+    return codificar_resposta(resposta.model_dump(exclude_none=True), request.headers.get("accept"))
 
+# Rota de previsão em lote
+@app.post("/predict/batch", openapi_extra=_corpo_openapi(_SCHEMA_LOTE_COLUNAR))
+async def predict_batch(request: Request, explain: bool = False):
+    """
+    Recebe um lote de projetos, preferencialmente no formato colunar
+    (uma lista por campo), e calcula todas as probabilidades em uma única
+    chamada ao modelo. A resposta também é colunar.
+    Com explain=true, inclui uma lista de contribuições por campo.
+    """
+    if model is None or threshold is None:
+        raise HTTPException(status_code=500, detail="Modelo não carregado.")
+
+    body = await request.body()
+    dados = decodificar_corpo(body, request.headers.get("content-type"))
+
+    # Monta o DataFrame direto dos arrays, sem objetos por linha,
+    # derivando as colunas de data de forma vetorizada
+    try:
+        df = build_feature_frame(lote_para_dataframe(dados, LOTE_DTYPES))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    proba = model.predict_proba(df)[:, 1]
+
+    resposta = {
+        "probabilidade_sucesso": np.round(proba, 4),
+        "sucesso": proba >= threshold,
+    }
+    if explain:
+        # Transposta contígua: uma linha por campo, serializada sem cópia pelo orjson
+        contrib = np.ascontiguousarray(np.round(explicador.explicar(df), 4).T)
+        resposta["valor_base"] = round(explicador.valor_base, 4)
+        resposta["contribuicoes"] = dict(zip(explicador.campos, contrib))
+
+    return codificar_resposta(resposta, request.headers.get("accept"))
+
+# Rota de simulação de cenários
+@app.post("/predict/what-if", response_model=WhatIfResponse)
+async def predict_what_if(req: WhatIfRequest):
+    """
+    Gera variações do projeto base (grade numérica de equipe, duração e
+    orçamento, e todas as categorias de cada campo categórico), calcula
+    todas em uma única chamada ao modelo e retorna as mudanças que mais
+    aumentam a probabilidade de sucesso. Os cenários pedidos pelo cliente
+    voltam sempre em `solicitadas`, mesmo quando pioram a previsão.
+    """
+    if model is None or threshold is None:
+        raise HTTPException(status_code=500, detail="Modelo não carregado.")
+
+    try:
+        base = record_features(req.projeto.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Com valores explícitos, a exploração automática só roda se for pedida
+    explorar = req.cenarios is None and all(getattr(req, campo) is None for campo in CAMPOS_GRADE)
+    completar_grades = explorar if req.completar_grades is None else req.completar_grades
+    variar_categoricos = explorar if req.variar_categoricos is None else req.variar_categoricos
+    combinar_numericos = explorar if req.combinar_numericos is None else req.combinar_numericos
+
+    enviadas = {campo: getattr(req, campo) for campo in CAMPOS_GRADE}
+    grades = {
+        campo: valores if valores is not None else (grade_padrao(campo, base[campo]) if completar_grades else [])
+        for campo, valores in enviadas.items()
+    }
 
+    try:
+        solicitadas = montar_solicitadas(base, enviadas, req.cenarios, categorias)
+        df, mudancas, linhas_solicitadas = montar_variacoes(
+            base,
+            grades,
+            categorias if variar_categoricos else {},
+            combinar_numericos=combinar_numericos,
+            solicitadas=solicitadas,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Projeto base e todas as variações em uma única chamada vetorizada
+    proba = model.predict_proba(df[FEATURES])[:, 1]
+
+    melhores = ranquear_variacoes(proba, mudancas, req.top_n)
+
+    def variacao(mudanca, p, ganho):
+        return VariacaoResponse(
+            mudancas=mudanca,
+            probabilidade_sucesso=round(p, 4),
+            ganho=round(ganho, 4),
+            sucesso=bool(p >= threshold),
+        )
+
+    return WhatIfResponse(
+        probabilidade_base=round(float(proba[0]), 4),
+        sucesso_base=bool(proba[0] >= threshold),
+        variacoes_avaliadas=len(mudancas) - 1,
+        solicitadas=[
+            variacao(mudanca, float(proba[i]), float(proba[i] - proba[0]))
+            for mudanca, i in zip(solicitadas, linhas_solicitadas)
+        ],
+        melhores=[variacao(mudanca, p, ganho) for mudanca, p, ganho in melhores],
+    )
@@ -0,0 +1,99 @@
+"""
+Benchmark e verificação do normalizador de entradas de projeto.
+
+Usa o corpus benchmarks/corpus_normalizacao.json (frases reais, com o
+resultado esperado) para:
+1. conferir se `normalize` (um projeto) e `normalize_many` (lote) chegam
+   ao resultado esperado em todos os casos;
+2. medir o tempo por projeto nos dois caminhos, replicando o corpus.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_normalizacao --linhas 100000
+"""
+import argparse
+import json
+import math
+import time
+import pandas as pd
+from chatbot.normalizacao import ProjectNormalizer
+
+CORPUS_PATH = 'benchmarks/corpus_normalizacao.json'
+
+
+def carregar_normalizador():
+    """
+    Monta o normalizador com os valores válidos do CSV, como o chatbot faz.
+    """
+    df = pd.read_csv('ml_model/data/projetos.csv')
+    valores = {
+        campo: sorted(df[campo].dropna().unique().tolist())
+        for campo in ProjectNormalizer.CATEGORICAL_FIELDS
+    }
+    return ProjectNormalizer(valores)
+
+
+def _igual(obtido, esperado):
+    if esperado is None:
+        return obtido is None or (isinstance(obtido, float) and math.isnan(obtido)) or obtido is pd.NA
+    if isinstance(esperado, (int, float)):
+        return obtido is not None and obtido is not pd.NA and math.isclose(float(obtido), esperado)
+    return obtido == esperado
+
+
+def verificar(normalizador, casos):
+    """
+    Compara os dois caminhos com o esperado e lista as divergências.
+    """
+    lote = normalizador.normalize_many([caso['entrada'] for caso in casos])
+    erros = []
+    for i, caso in enumerate(casos):
+        unico = normalizador.normalize(dict(caso['entrada']))
+        for campo, esperado in caso['esperado'].items():
+            obtidos = {'normalize': unico.get(campo), 'normalize_many': lote.at[i, campo]}
+            for caminho, obtido in obtidos.items():
+                if not _igual(obtido, esperado):
+                    erros.append(
+                        f"  caso {i} [{caminho}] {campo}: {caso['entrada'].get(campo)!r} "
+                        f"-> {obtido!r} (esperado {esperado!r})"
+                    )
+    return erros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do normalizador de projetos.")
+    parser.add_argument('--linhas', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        casos = json.load(f)['casos']
+
+    inicio = time.perf_counter()
+    normalizador = carregar_normalizador()
+    print(f"Construção do normalizador: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    erros = verificar(normalizador, casos)
+    total = sum(len(caso['esperado']) for caso in casos)
+    print(f"Corpus: {len(casos)} projetos, {total} campos, {len(erros)} divergências")
+    for erro in erros:
+        print(erro)
+
+    entradas = [caso['entrada'] for caso in casos]
+    registros = (entradas * (args.linhas // len(entradas) + 1))[:args.linhas]
+
+    inicio = time.perf_counter()
+    for registro in registros:
+        normalizador.normalize(dict(registro))
+    tempo_unico = time.perf_counter() - inicio
+
+    df = pd.DataFrame.from_records(registros)
+    inicio = time.perf_counter()
+    normalizador.normalize_many(df)
+    tempo_lote = time.perf_counter() - inicio
+
+    print(f"\n{len(registros)} projetos:")
+    print(f"  normalize (um por vez)  {tempo_unico:7.2f}s  {len(registros) / tempo_unico:12,.0f} projetos/s")
+    print(f"  normalize_many (lote)   {tempo_lote:7.2f}s  {len(registros) / tempo_lote:12,.0f} projetos/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark do scoring de portfólio em lote.
+
+Replica ml_model/data/projetos.csv até o número de linhas pedido, grava em um
+diretório temporário e pontua o arquivo com diferentes números de processos,
+reportando linhas por segundo.
+
+Uso (na raiz do projeto, com ml_model/model.pkl treinado):
+    python -m benchmarks.bench_portfolio --linhas 500000 --workers 1 2 4
+"""
+import argparse
+import os
+import tempfile
+import pandas as pd
+from ml_model.score_portfolio import score_portfolio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do scoring de portfólio.")
+    parser.add_argument('--linhas', type=int, default=500_000)
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--formato', choices=['csv', 'parquet'], default='csv')
+    args = parser.parse_args()
+
+    base = pd.read_csv('ml_model/data/projetos.csv')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'portfolio.csv')
+        repeticoes = -(-args.linhas // len(base))
+        # Grava a entrada em blocos para não montar o arquivo inteiro em memória
+        with open(input_path, 'w', newline='', encoding='utf-8') as f:
+            base.to_csv(f, index=False)
+            for _ in range(repeticoes - 1):
+                base.to_csv(f, index=False, header=False)
+        total = repeticoes * len(base)
+        print(f"Entrada: {total} linhas ({os.path.getsize(input_path) / 2**20:.1f} MiB)\n")
+
+        for workers in args.workers:
+            output_path = os.path.join(tmp, f'previsoes.{args.formato}')
+            rows, elapsed = score_portfolio(
+                input_path, output_path, chunksize=args.chunksize, workers=workers
+            )
+            print(f"  {workers:>2} processo(s): {elapsed:7.2f}s  {rows / elapsed:12,.0f} linhas/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark dos formatos de entrada e saída da API de previsão.
+
+Compara, para um lote de projetos lido de ml_model/data/projetos.csv, o custo de
+decodificar o corpo, validar e montar o DataFrame de entrada do modelo, além do
+custo de serializar a resposta. O modelo não é chamado: mede-se apenas o que
+a API gasta antes e depois do predict_proba.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_serializacao --linhas 5000 --repeticoes 20
+"""
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+import orjson
+import msgpack
+from api.main import ProjetoRequest, LOTE_DTYPES
+from api.formatos import lote_para_dataframe
+from ml_model.features import FEATURES, build_feature_frame
+
+
+def carregar_lote(linhas):
+    """
+    Lê projetos do CSV e deriva as colunas de data usadas pela API.
+    """
+    df = build_feature_frame(pd.read_csv('ml_model/data/projetos.csv'))
+    if linhas > len(df):
+        df = pd.concat([df] * (linhas // len(df) + 1), ignore_index=True)
+    return df.head(linhas)
+
+
+def medir(funcao, repeticoes):
+    """
+    Executa a função várias vezes e retorna o melhor tempo em milissegundos.
+    """
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialização da API.")
+    parser.add_argument('--linhas', type=int, default=5000)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    df = carregar_lote(args.linhas)
+    registros = json.loads(df.to_json(orient='records', force_ascii=False))
+    colunas = {campo: df[campo].tolist() for campo in FEATURES}
+
+    corpos = {
+        'json linhas (stdlib + pydantic)': json.dumps(registros).encode('utf-8'),
+        'orjson linhas': orjson.dumps(registros),
+        'orjson colunar': orjson.dumps(colunas),
+        'msgpack colunar': msgpack.packb(colunas, use_bin_type=True),
+    }
+
+    entradas = {
+        'json linhas (stdlib + pydantic)': lambda: pd.DataFrame(
+            [ProjetoRequest(**r).model_dump() for r in json.loads(corpos['json linhas (stdlib + pydantic)'])]
+        ),
+        'orjson linhas': lambda: lote_para_dataframe(orjson.loads(corpos['orjson linhas']), LOTE_DTYPES),
+        'orjson colunar': lambda: lote_para_dataframe(orjson.loads(corpos['orjson colunar']), LOTE_DTYPES),
+        'msgpack colunar': lambda: lote_para_dataframe(
+            msgpack.unpackb(corpos['msgpack colunar'], raw=False), LOTE_DTYPES
+        ),
+    }
+
+    proba = np.random.default_rng(42).random(len(df))
+    sucesso = proba >= 0.5
+    saidas = {
+        'json linhas (stdlib)': lambda: json.dumps(
+            [{'probabilidade_sucesso': round(float(p), 4), 'sucesso': bool(s)} for p, s in zip(proba, sucesso)]
+        ).encode('utf-8'),
+        'orjson colunar': lambda: orjson.dumps(
+            {'probabilidade_sucesso': np.round(proba, 4), 'sucesso': sucesso},
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        ),
+        'msgpack colunar': lambda: msgpack.packb(
+            {'probabilidade_sucesso': np.round(proba, 4).tolist(), 'sucesso': sucesso.tolist()},
+            use_bin_type=True,
+        ),
+    }
+
+    print(f"Lote de {len(df)} projetos, melhor de {args.repeticoes} execuções\n")
+    print("Entrada (decodificação + validação + DataFrame):")
+    for nome, funcao in entradas.items():
+        ms = medir(funcao, args.repeticoes)
+        print(f"  {nome:<34} {ms:9.2f} ms  {len(corpos[nome]) / 1024:9.1f} KiB")
+
+    print("\nSaída (serialização da resposta):")
+    for nome, funcao in saidas.items():
+        ms = medir(funcao, args.repeticoes)
+        print(f"  {nome:<34} {ms:9.2f} ms  {len(funcao()) / 1024:9.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
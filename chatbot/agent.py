@@ -5,12 +5,17 @@ from langchain.agents import create_openai_functions_agent, AgentExecutor
 from langchain.memory import ConversationBufferMemory
 import pandas as pd
 import os
+from typing import Dict, List, Optional, Union
 from previsao import (
     predict_project_success,
     format_prediction_response,
+    describe_prediction_drivers,
     get_missing_fields,
-    normalize_project_data
+    normalize_project_data,
+    simulate_project_scenarios,
+    format_scenarios_response
 )
+from cache_llm import get_llm_cache
 
 # Função principal de previsão
 def prever_projeto_tool(
@@ -52,20 +57,28 @@ def prever_projeto_tool(
     if missing:
         return f"Atenção: Campos obrigatórios ausentes ou inválidos: {missing}"
 
-    # Chama a previsão na API
-    prediction = predict_project_success(project_data)
+    # Chama a previsão na API, já com a contribuição de cada campo
+    try:
+        prediction = predict_project_success(project_data, explain=True)
+    except ValueError as e:
+        return f"Atenção: {e}"
     base_result = format_prediction_response(prediction, project_data)
+    drivers = describe_prediction_drivers(prediction)
 
-    # Pede ao modelo uma recomendação curta e corporativa
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+    # Pede ao modelo uma recomendação curta e corporativa (a mesma previsão reaproveita a resposta do cache)
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, cache=get_llm_cache())
     user_prompt = f"""
     O resultado da previsão é:
 
     {base_result}
 
+    Contribuição dos dados do projeto para a probabilidade (segundo o modelo):
+
+    {drivers}
+
     Gere uma recomendação curta, corporativa, clara, em 2 linhas no máximo,
-    levando em consideração os dados do projeto, como duração, orçamento,
-    recursos, tipo, complexidade, metodologia e risco.
+    focada nos fatores que mais reduziram a chance de sucesso e no que pode
+    ser ajustado neles, levando em consideração os dados do projeto.
     """
 
     recommendation = llm.invoke(user_prompt).content.strip()
@@ -80,6 +93,82 @@ previsao_tool = StructuredTool.from_function(
     description="Prevê o sucesso de um projeto."
 )
 
+# Função de simulação de cenários (what-if)
+def simular_cenarios_tool(
+    duracao_meses: int,
+    orcamento: float,
+    entregas: int,
+    tamanho_equipe: int,
+    recursos_disponiveis: str,
+    data_inicio: str,
+    tipo_projeto: str,
+    departamento: str,
+    complexidade: str,
+    metodologia: str,
+    risco: str,
+    tamanhos_equipe: Optional[List[int]] = None,
+    duracoes_meses: Optional[List[int]] = None,
+    orcamentos: Optional[List[float]] = None,
+    cenarios: Optional[List[Dict[str, Union[int, float, str]]]] = None,
+) -> str:
+    """
+    Recebe os dados do projeto base, normaliza, valida e simula em uma única
+    chamada as variações do projeto. Sem valores específicos, explora equipe,
+    duração, orçamento e campos categóricos e retorna as mudanças que mais
+    aumentam a chance de sucesso. As listas opcionais e `cenarios` (campo ->
+    novo valor, ex.: [{'metodologia': 'Scrum'}]) trazem o que o usuário citou;
+    nesse caso só eles são avaliados e sempre aparecem na resposta, mesmo
+    quando pioram a previsão.
+    """
+    project_data = {
+        'duracao_meses': duracao_meses,
+        'orcamento': orcamento,
+        'entregas': entregas,
+        'tamanho_equipe': tamanho_equipe,
+        'recursos_disponiveis': recursos_disponiveis,
+        'data_inicio': data_inicio,
+        'tipo_projeto': tipo_projeto,
+        'departamento': departamento,
+        'complexidade': complexidade,
+        'metodologia': metodologia,
+        'risco': risco
+    }
+
+    # Normaliza valores e faz parsing de texto
+    project_data = normalize_project_data(project_data)
+
+    # Verifica campos obrigatórios faltantes
+    missing = get_missing_fields(project_data)
+    if missing:
+        return f"Atenção: Campos obrigatórios ausentes ou inválidos: {missing}"
+
+    # Simula todas as variações na API
+    try:
+        scenarios = simulate_project_scenarios(
+            project_data,
+            variations={
+                'tamanho_equipe': tamanhos_equipe,
+                'duracao_meses': duracoes_meses,
+                'orcamento': orcamentos,
+            },
+            scenarios=cenarios,
+        )
+    except ValueError as e:
+        return f"Atenção: {e}"
+    return format_scenarios_response(scenarios, project_data)
+
+
+# Registra a função como StructuredTool
+cenarios_tool = StructuredTool.from_function(
+    simular_cenarios_tool,
+    name="SimularCenarios",
+    description=(
+        "Simula cenários 'e se' de um projeto (ex.: outra metodologia, outro tamanho de equipe, "
+        "outro orçamento ou duração). Com valores específicos (listas ou cenarios), retorna o resultado "
+        "de cada um; sem eles, retorna as mudanças que mais aumentam a chance de sucesso."
+    )
+)
+
 # Função para histórico de usuário
 
 # Carrega o CSV de usuários uma única vez
@@ -162,13 +251,23 @@ prompt = ChatPromptTemplate.from_messages([
      "Use the user context (name, role, or success rate) to briefly explain in one short sentence "
      "how their experience or history may influence the project's success.\n\n"
 
+     "If the user asks what-if questions about a project (for example, 'what if the team were 10 people', "
+     "'what if we used Scrum instead of Waterfall', or which changes would improve the chances of success), "
+     "use the scenario simulation tool once with the project's 11 values, passing any specific team sizes, "
+     "durations, or budgets mentioned by the user in the optional lists, and any other specific change "
+     "(for example a different methodology or risk, or several fields changed together) in 'cenarios', "
+     "as a list of objects mapping each changed field to its new value. "
+     "Never call the prediction tool repeatedly to compare scenarios. "
+     "Answer first the scenarios the user asked about, saying whether each one raises or lowers the chance "
+     "of success, then briefly mention the top changes, in corporate Brazilian Portuguese.\n\n"
+
      "If the user asks about someone’s history, use the history tool and write a short line praising or suggesting improvements. "
      "If the user does not specify a name, ask whose history they would like to know.\n\n"
 
      "If the user asks anything outside the scope of project predictions or user history, "
-     "explain that you are a corporate chatbot focused on project success predictions and user history only. "
+     "explain that you are a corporate chatbot focused on project success predictions, scenario simulations and user history only. "
      "If the user asks what you do, answer that you are a chatbot for project success prediction "
-     "and that you can also provide user history.\n\n"
+     "and that you can also simulate scenarios and provide user history.\n\n"
 
      "When replying in Portuguese, always keep the official methodology names exactly as they are: Agile, Waterfall, Scrum, Kanban, XP. Never translate them."
     ),
@@ -186,17 +285,17 @@ memory = ConversationBufferMemory(
 )
 
 # Executor do Agent
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, cache=get_llm_cache())
 
 agent = create_openai_functions_agent(
     llm,
-    [previsao_tool, historico_tool],
+    [previsao_tool, cenarios_tool, historico_tool],
     prompt
 )
 
 agent_executor = AgentExecutor(
     agent=agent,
-    tools=[previsao_tool, historico_tool],
+    tools=[previsao_tool, cenarios_tool, historico_tool],
     memory=memory,
     verbose=True
 )
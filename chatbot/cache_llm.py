@@ -0,0 +1,203 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+# Configuração por variáveis de ambiente
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite")
+CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Tempo máximo de uma chamada ao LLM; misses mais antigos que isso (chamadas que
+# falharam e nunca chegaram ao update) são descartados da medição de latência
+PENDING_TIMEOUT_SECONDS = 600
+
+# Classes que `update` grava e que `lookup` pode reconstruir a partir do cache
+CACHED_OBJECTS = (Generation, ChatGeneration, AIMessage)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    chave TEXT PRIMARY KEY,
+    resposta TEXT NOT NULL,
+    latencia_ms REAL NOT NULL DEFAULT 0,
+    criado_em REAL NOT NULL,
+    acessado_em REAL NOT NULL,
+    acertos INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_respostas_acessado_em ON respostas (acessado_em);
+CREATE TABLE IF NOT EXISTS contadores (
+    nome TEXT PRIMARY KEY,
+    valor REAL NOT NULL DEFAULT 0
+);
+"""
+
+# Soma um valor a um contador do arquivo, criando-o se ainda não existir
+_INCREMENTA_CONTADOR = (
+    "INSERT INTO contadores (nome, valor) VALUES (?, ?) "
+    "ON CONFLICT(nome) DO UPDATE SET valor = valor + excluded.valor"
+)
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    Cache persistente e local das respostas do LLM, em SQLite.
+
+    Implementa a interface de cache do LangChain, então basta passar a
+    instância em `ChatOpenAI(cache=...)`. A chave é o hash SHA-256 da
+    configuração do modelo (nome, temperatura e demais parâmetros, no
+    `llm_string`) junto com as mensagens serializadas de forma canônica.
+
+    - Entradas expiram após `ttl_seconds` e, acima de `max_entries`, as
+      menos acessadas recentemente são removidas.
+    - Cada operação abre a própria conexão em modo WAL, então o mesmo arquivo
+      pode ser usado por várias threads e processos ao mesmo tempo.
+    - `stats()` informa taxa de acerto e o tempo de LLM economizado.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl_seconds=CACHE_TTL_SECONDS,
+                 max_entries=CACHE_MAX_ENTRIES, evict_every=50):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+
+        self._lock = threading.Lock()
+        self._pending = {}  # chave -> instante do miss, para medir a latência da chamada real
+        self._hits = 0
+        self._misses = 0
+        self._saved_ms = 0.0
+        self._writes = 0
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    @staticmethod
+    def _key(prompt, llm_string):
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt, llm_string):
+        """Retorna as gerações em cache ou None (e começa a medir a chamada real)."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT resposta, latencia_ms FROM respostas WHERE chave = ? AND criado_em >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE respostas SET acessado_em = ?, acertos = acertos + 1 WHERE chave = ?",
+                    (now, key),
+                )
+                conn.executemany(_INCREMENTA_CONTADOR, [("acertos", 1), ("economizado_ms", row[1])])
+            else:
+                conn.execute(_INCREMENTA_CONTADOR, ("falhas", 1))
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                started = time.perf_counter()
+                self._pending = {
+                    k: t for k, t in self._pending.items() if started - t < PENDING_TIMEOUT_SECONDS
+                }
+                self._pending[key] = started
+                return None
+            self._hits += 1
+            self._saved_ms += row[1]
+
+        return loads(row[0], allowed_objects=CACHED_OBJECTS)
+
+    def update(self, prompt, llm_string, return_val):
+        """Grava a resposta gerada pelo LLM, com a latência medida desde o miss."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            started = self._pending.pop(key, None)
+            self._writes += 1
+            evict = self._writes % self.evict_every == 0
+        latency_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO respostas (chave, resposta, latencia_ms, criado_em, acessado_em, acertos) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, dumps(return_val), latency_ms, now, now),
+            )
+            if evict:
+                self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """Remove entradas expiradas e, se preciso, as menos acessadas recentemente."""
+        conn.execute("DELETE FROM respostas WHERE criado_em < ?", (now - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM respostas WHERE chave IN ("
+            "SELECT chave FROM respostas ORDER BY acessado_em DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self, **kwargs):
+        """Apaga todas as respostas do cache e zera os contadores do arquivo."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM respostas")
+            conn.execute("DELETE FROM contadores")
+
+    def stats(self):
+        """
+        Estatísticas do processo atual (acertos, falhas, taxa de acerto e
+        tempo economizado) e do arquivo de cache como um todo (`total_*`),
+        somando todos os processos. Os totais ficam em uma tabela própria,
+        então não diminuem quando entradas expiram ou são removidas.
+        """
+        with closing(self._connect()) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+            totals = dict(conn.execute("SELECT nome, valor FROM contadores").fetchall())
+        total_hits = int(totals.get("acertos", 0))
+        total_misses = int(totals.get("falhas", 0))
+        total_lookups = total_hits + total_misses
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "saved_seconds": self._saved_ms / 1000,
+                "entries": entries,
+                "total_hits": total_hits,
+                "total_misses": total_misses,
+                "total_hit_rate": total_hits / total_lookups if total_lookups else 0.0,
+                "total_saved_seconds": totals.get("economizado_ms", 0.0) / 1000,
+            }
+
+
+# Instância compartilhada por todos os pontos de chamada do chatbot
+_llm_cache = None
+
+
+def get_llm_cache(enabled=True):
+    """
+    Retorna o cache a ser passado em `ChatOpenAI(cache=...)`.
+    Para desligar o cache em um ponto de chamada, use enabled=False;
+    para desligar em todos, defina LLM_CACHE_ENABLED=0.
+    """
+    global _llm_cache
+    if not (enabled and CACHE_ENABLED):
+        return False
+    if _llm_cache is None:
+        _llm_cache = SQLiteResponseCache()
+    return _llm_cache
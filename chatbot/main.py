@@ -2,6 +2,7 @@ import os
 import streamlit as st
 import pandas as pd
 from agent import agent_executor  # Executor configurado no agent.py
+from cache_llm import get_llm_cache
 
 # Função para carregar os dados dos usuários
 @st.cache_data
@@ -105,3 +106,14 @@ if prompt:
 
         # Guarda resposta no histórico
         st.session_state.messages.append({"role": "assistant", "content": output})
+
+# Exibe o aproveitamento do cache de respostas do LLM (depois da resposta, para já contar esta pergunta).
+# Os números são do arquivo de cache inteiro, somando todas as sessões e processos.
+llm_cache = get_llm_cache()
+if llm_cache:
+    cache_stats = llm_cache.stats()
+    st.sidebar.caption(
+        f"Cache do LLM (todas as sessões): {cache_stats['total_hit_rate']:.0%} de acertos "
+        f"({cache_stats['total_hits']} de {cache_stats['total_hits'] + cache_stats['total_misses']} chamadas), "
+        f"{cache_stats['total_saved_seconds']:.1f}s economizados"
+    )
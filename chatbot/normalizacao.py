@@ -0,0 +1,377 @@
+import difflib
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Remoção de acentos por tabela (aplicada depois do lower())
+ACCENT_TABLE = str.maketrans(
+    'áàâãäéèêëíìîïóòôõöúùûüçñ',
+    'aaaaaeeeeiiiiooooouuuucn',
+)
+
+# Multiplicadores de orçamento, já sem acento
+BUDGET_MULTIPLIERS = {
+    'mil': 1_000, 'k': 1_000,
+    'milhao': 1_000_000, 'milhoes': 1_000_000, 'mi': 1_000_000, 'mm': 1_000_000, 'm': 1_000_000,
+    'bilhao': 1_000_000_000, 'bilhoes': 1_000_000_000, 'bi': 1_000_000_000,
+}
+
+# Unidades de duração convertidas para meses
+DURATION_UNITS = {
+    'mes': 1, 'meses': 1, 'ano': 12, 'anos': 12,
+    'month': 1, 'months': 1, 'year': 12, 'years': 12,
+}
+
+# Variações aceitas para recursos disponíveis (0 = Baixo, 1 = Médio, 2 = Alto)
+RESOURCE_LEVELS = {
+    'baixo': 0, 'baixa': 0, 'baixos': 0, 'baixas': 0, 'low': 0, '0': 0,
+    'medio': 1, 'media': 1, 'medios': 1, 'medias': 1, 'medium': 1, '1': 1,
+    'alto': 2, 'alta': 2, 'altos': 2, 'altas': 2, 'high': 2, '2': 2,
+}
+
+# Sinônimos (inclusive em inglês, como o agente às vezes envia) para os campos categóricos
+CATEGORY_ALIASES = {
+    'it': 'ti', 'hr': 'rh', 'recursos humanos': 'rh', 'human resources': 'rh',
+    'operations': 'operacoes', 'finance': 'financeiro', 'financas': 'financeiro',
+    'infrastructure': 'infraestrutura', 'infra': 'infraestrutura',
+    'research': 'pesquisa', 'construction': 'construcao',
+    'low': 'baixo', 'medium': 'medio', 'high': 'alto',
+    'agil': 'agile', 'cascata': 'waterfall',
+}
+
+# Número isolado: não começa no meio de outra palavra ou número ("1e6" não vira 6)
+_NUMBER = r'(?<![a-z\d.,])\d+(?:[.,]\d+)*'
+_BUDGET_UNITS = '|'.join(sorted(BUDGET_MULTIPLIERS, key=len, reverse=True))
+
+# Número seguido de um multiplicador opcional ("1.5 milhao", "200k", "R$ 300.000,00")
+BUDGET_RE = re.compile(rf'({_NUMBER})\s*({_BUDGET_UNITS})?(?![a-z])')
+
+# Número seguido de uma palavra opcional ("8 meses", "2 anos", "10 pessoas")
+QUANTITY_RE = re.compile(rf'({_NUMBER})\s*([a-z]+)?')
+
+# Ligação entre as partes de um valor composto ("1 milhão e 500 mil", "1 ano e 6 meses")
+COMPOUND_SEP_RE = re.compile(r'\s+e\s+')
+
+# Números por extenso comuns em orçamentos ("um milhão", "meio milhão", "dois milhões")
+BUDGET_NUMBER_WORDS = {
+    'meio': '0.5', 'um': '1', 'uma': '1', 'dois': '2', 'duas': '2', 'tres': '3',
+    'quatro': '4', 'cinco': '5', 'seis': '6', 'sete': '7', 'oito': '8', 'nove': '9', 'dez': '10',
+}
+# Só converte a palavra quando ela vem antes de um multiplicador ("um orçamento" fica como está)
+BUDGET_WORDS_RE = re.compile(
+    rf'\b({"|".join(BUDGET_NUMBER_WORDS)})(?=\s+(?:milhao|milhoes|mil|bilhao|bilhoes)\b)'
+)
+
+
+def _budget_word(match):
+    return BUDGET_NUMBER_WORDS[match.group(1)]
+
+
+def clean_text(value):
+    """Converte para minúsculas, sem acentos e sem espaços nas pontas."""
+    return str(value).lower().translate(ACCENT_TABLE).strip()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
+
+
+def parse_number(text, thousands=True):
+    """
+    Converte um número escrito em português ou inglês para float:
+    '1.500.000,00', '1,500,000', '500.000', '1.5', '1,5'.
+    Com um único separador seguido de 3 dígitos, ele é tratado como
+    separador de milhar se `thousands` for True.
+    """
+    dots, commas = text.count('.'), text.count(',')
+    if dots and commas:
+        if text.rfind(',') > text.rfind('.'):
+            text = text.replace('.', '').replace(',', '.')
+        else:
+            text = text.replace(',', '')
+    elif dots + commas > 1:
+        text = text.replace('.', '').replace(',', '')
+    elif dots + commas == 1:
+        sep = '.' if dots else ','
+        if thousands and len(text) - text.index(sep) - 1 == 3:
+            text = text.replace(sep, '')
+        else:
+            text = text.replace(',', '.')
+    return float(text)
+
+
+def combine_parts(text, matches, multipliers, thousands=True):
+    """
+    Converte os números encontrados em `text` (matches com número e unidade)
+    em um único valor. Com mais de um número, só soma quando as partes são
+    ligadas por 'e' e as unidades vão da maior para a menor, como em
+    '1 milhão e 500 mil'. Qualquer outra combinação (uma faixa como
+    '800 mil a 1 milhão', por exemplo) é ambígua e retorna None.
+    """
+    total, previous = 0.0, None
+    for i, match in enumerate(matches):
+        if i and not COMPOUND_SEP_RE.fullmatch(text, matches[i - 1].end(), match.start()):
+            return None
+        multiplier = multipliers[match.group(2)] if match.group(2) else 1
+        if previous is not None and multiplier >= previous:
+            return None
+        total += parse_number(match.group(1), thousands) * multiplier
+        previous = multiplier
+    return total
+
+
+def parse_number_series(numbers, thousands=True):
+    """
+    Versão vetorizada de parse_number para uma Series de textos numéricos.
+    """
+    dots = numbers.str.count(r'\.')
+    commas = numbers.str.count(',')
+    last_dot = numbers.str.rfind('.')
+    last_comma = numbers.str.rfind(',')
+
+    both = (dots > 0) & (commas > 0)
+    comma_decimal = both & (last_comma > last_dot)
+    dot_decimal = both & ~comma_decimal
+    separators = dots + commas
+    grouped = ~both & (separators > 1)
+    if thousands:
+        last_sep = np.maximum(last_dot, last_comma)
+        grouped |= ~both & (separators == 1) & (numbers.str.len() - last_sep - 1 == 3)
+
+    result = numbers.str.replace(',', '.', regex=False)
+    result[comma_decimal] = numbers[comma_decimal].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    result[dot_decimal] = numbers[dot_decimal].str.replace(',', '', regex=False)
+    result[grouped] = numbers[grouped].str.replace(r'[.,]', '', regex=True)
+    return result.astype(float)
+
+
+class ProjectNormalizer:
+    """
+    Normaliza as entradas de projeto digitadas pelo usuário (ou repassadas
+    pelo agente) para os valores esperados pela API.
+
+    Regex, tabelas de unidades e opções categóricas são preparadas uma única
+    vez na construção. `normalize` trata um projeto (dict) e `normalize_many`
+    trata uma lista de projetos ou um DataFrame com operações vetorizadas.
+    """
+
+    CATEGORICAL_FIELDS = ('tipo_projeto', 'departamento', 'complexidade', 'metodologia', 'risco')
+
+    def __init__(self, categorical_values, cutoff=0.6):
+        self.cutoff = cutoff
+        # Para cada campo: forma limpa (sem acento, minúscula) -> valor original do CSV
+        self.options = {
+            field: {clean_text(option): option for option in categorical_values.get(field, [])}
+            for field in self.CATEGORICAL_FIELDS
+        }
+        self._fuzzy = lru_cache(maxsize=4096)(self._fuzzy_uncached)
+
+    # Valores individuais
+
+    def parse_budget(self, value):
+        """
+        Converte o orçamento para reais. Aceita multiplicadores (mil, milhão,
+        milhões, k, mi, bi), números por extenso ('um milhão') e valores
+        compostos como '1 milhão e 500 mil'. Faixas e outros textos com
+        vários números retornam None.
+        """
+        if _is_number(value):
+            return float(value)
+        text = BUDGET_WORDS_RE.sub(_budget_word, clean_text(value))
+        matches = list(BUDGET_RE.finditer(text))
+        if not matches:
+            return None
+        return combine_parts(text, matches, BUDGET_MULTIPLIERS)
+
+    def parse_quantity(self, value, units=None):
+        """
+        Extrai um número inteiro de textos como '8 meses', '3 entregas' ou
+        '1.000 pessoas'. Com `units`, a palavra após o número precisa estar na
+        tabela e é usada como multiplicador ('2 anos' = 24 meses, '1 ano e
+        6 meses' = 18); unidades desconhecidas ('6 semanas') retornam None.
+        Sem `units`, textos com mais de um número ('entre 5 e 8 pessoas')
+        são ambíguos e retornam None. Valores não inteiros ('2,5') também.
+        """
+        if _is_number(value):
+            total = float(value)
+        else:
+            text = clean_text(value)
+            matches = list(QUANTITY_RE.finditer(text))
+            if not matches:
+                return None
+            if units:
+                if any(match.group(2) and match.group(2) not in units for match in matches):
+                    return None
+                total = combine_parts(text, matches, units, thousands=False)
+            elif len(matches) == 1:
+                total = parse_number(matches[0].group(1))
+            else:
+                return None
+        if total is None or not float(total).is_integer():
+            return None
+        return int(total)
+
+    def parse_resources(self, value):
+        """Converte recursos disponíveis para 0 (Baixo), 1 (Médio) ou 2 (Alto)."""
+        if _is_number(value):
+            return int(value) if value in (0, 1, 2) else None
+        return RESOURCE_LEVELS.get(clean_text(value))
+
+    def _fuzzy_uncached(self, field, key):
+        options = self.options[field]
+        matches = difflib.get_close_matches(key, list(options), n=1, cutoff=self.cutoff)
+        return options[matches[0]] if matches else None
+
+    def match_category(self, field, value):
+        """
+        Encontra o valor original do CSV para um campo categórico:
+        primeiro por igualdade sem acento, depois por sinônimo e por fim por
+        fuzzy match (com cache por texto).
+        """
+        if not isinstance(value, str) or not value.strip():
+            return None
+        key = clean_text(value)
+        key = CATEGORY_ALIASES.get(key, key)
+        options = self.options[field]
+        if key in options:
+            return options[key]
+        return self._fuzzy(field, key)
+
+    # Um projeto
+
+    def normalize(self, project_data):
+        """
+        Normaliza todos os campos de um projeto, no próprio dicionário:
+        - Converte textos com palavras extras (ex: 'meses', 'entregas') em números puros.
+        - Remove os campos numéricos que não puderam ser interpretados.
+        - Valida e normaliza valores categóricos; os inválidos vão para '__invalid_fields'.
+        """
+        parsers = {
+            'duracao_meses': lambda v: self.parse_quantity(v, DURATION_UNITS),
+            'orcamento': self.parse_budget,
+            'entregas': self.parse_quantity,
+            'tamanho_equipe': self.parse_quantity,
+            'recursos_disponiveis': self.parse_resources,
+        }
+        for field, parse in parsers.items():
+            try:
+                parsed = parse(project_data.get(field, ''))
+            except (ValueError, OverflowError):
+                parsed = None
+            if parsed is None:
+                project_data.pop(field, None)
+            else:
+                project_data[field] = parsed
+
+        project_data['__invalid_fields'] = {}
+        for field in self.CATEGORICAL_FIELDS:
+            val = project_data.get(field, None)
+            if not val or str(val).strip() == "":
+                project_data[field] = None
+                continue
+
+            match = self.match_category(field, val)
+            if match is None:
+                project_data['__invalid_fields'][field] = val
+            project_data[field] = match
+
+        return project_data
+
+    # Vários projetos
+
+    def _text(self, column):
+        """Converte a parte textual de uma coluna para a forma limpa, de uma vez."""
+        return column.astype(str).str.lower().str.translate(ACCENT_TABLE).str.strip()
+
+    def _numeric(self, column):
+        """Separa os valores já numéricos dos que precisam de parsing de texto."""
+        numeric = pd.to_numeric(column.where(column.map(_is_number)), errors='coerce')
+        return numeric, numeric.isna() & column.notna()
+
+    @staticmethod
+    def _per_unique(column, parse):
+        """
+        Aplica `parse` só aos valores distintos da coluna e espalha o resultado
+        de volta para todas as linhas. Entradas de usuários se repetem muito,
+        então o trabalho de texto cai de uma vez por linha para uma por valor.
+        """
+        codes, uniques = pd.factorize(column)
+        if len(uniques) == 0:
+            return pd.Series(np.nan, index=column.index)
+        parsed = parse(pd.Series(uniques, dtype=object)).to_numpy(dtype=float, na_value=np.nan)
+        return pd.Series(np.where(codes >= 0, parsed[codes], np.nan), index=column.index)
+
+    def _budget_series(self, column):
+        result, pending = self._numeric(column)
+        if pending.any():
+            text = self._text(column[pending]).str.replace(BUDGET_WORDS_RE, _budget_word, regex=True)
+            counts = text.str.count(BUDGET_RE)
+            single = counts == 1
+            parts = text[single].str.extract(BUDGET_RE)
+            result.loc[parts.index] = parse_number_series(parts[0]) * parts[1].map(BUDGET_MULTIPLIERS).fillna(1)
+            # Valores compostos ou faixas são raros: seguem a mesma regra do parser de um projeto
+            several = counts[counts > 1].index
+            result.loc[several] = column[several].map(self.parse_budget).astype(float)
+        return result
+
+    def _quantity_series(self, column, units=None):
+        result, pending = self._numeric(column)
+        if pending.any():
+            text = self._text(column[pending])
+            counts = text.str.count(QUANTITY_RE)
+            text = text[counts == 1]
+            # Valores compostos ou com vários números seguem a regra do parser de um projeto
+            several = counts[counts > 1].index
+            parse = lambda value: self.parse_quantity(value, units)
+            result.loc[several] = column[several].map(parse).astype(float)
+            parts = text.str.extract(QUANTITY_RE)
+            found = parts[0].notna()
+            values = parse_number_series(parts.loc[found, 0], thousands=not units)
+            if units:
+                # Sem unidade vale o número puro; unidade fora da tabela invalida o valor
+                unit = parts.loc[found, 1]
+                values *= unit.map(units).where(unit.notna(), 1)
+            result.loc[values.index] = values
+        # Valores não inteiros são rejeitados, não truncados
+        return result.where(result == np.trunc(result))
+
+    def _resources_series(self, column):
+        numeric, pending = self._numeric(column)
+        result = numeric.where(numeric.isin([0, 1, 2]))
+        if pending.any():
+            result.loc[pending] = self._text(column[pending]).map(RESOURCE_LEVELS)
+        return result
+
+    def _category_series(self, field, column):
+        uniques = column.dropna().unique()
+        mapping = {value: self.match_category(field, value) for value in uniques}
+        return column.map(mapping).astype(object).where(lambda s: s.notna(), None)
+
+    def normalize_many(self, projects):
+        """
+        Normaliza vários projetos de uma vez (lista de dicionários ou DataFrame).
+
+        Retorna um DataFrame com os campos normalizados. Valores numéricos
+        que não puderam ser interpretados ficam nulos (NaN/<NA>) e categóricos
+        inválidos como None. O parsing de texto e o fuzzy match rodam uma vez
+        por valor distinto de cada coluna.
+        """
+        df = projects if isinstance(projects, pd.DataFrame) else pd.DataFrame.from_records(projects)
+        df = df.reset_index(drop=True)
+        out = df.copy()
+
+        def column(field):
+            return df[field].astype(object) if field in df else pd.Series([None] * len(df), dtype=object)
+
+        parse_duration = lambda values: self._quantity_series(values, DURATION_UNITS)
+        out['duracao_meses'] = self._per_unique(column('duracao_meses'), parse_duration).astype('Int64')
+        out['orcamento'] = self._per_unique(column('orcamento'), self._budget_series)
+        out['entregas'] = self._per_unique(column('entregas'), self._quantity_series).astype('Int64')
+        out['tamanho_equipe'] = self._per_unique(column('tamanho_equipe'), self._quantity_series).astype('Int64')
+        out['recursos_disponiveis'] = self._per_unique(
+            column('recursos_disponiveis'), self._resources_series
+        ).astype('Int64')
+        for field in self.CATEGORICAL_FIELDS:
+            out[field] = self._category_series(field, column(field))
+        return out
@@ -1,11 +1,9 @@
 import os
 import json
-import re
-import difflib
-from datetime import datetime
 import pandas as pd
 from dotenv import load_dotenv
 import requests
+from normalizacao import DURATION_UNITS, ProjectNormalizer
 
 # Carrega variáveis de ambiente (como URL da API)
 load_dotenv()
@@ -41,21 +39,17 @@ def get_categorical_field_values():
     _categorical_values_cache = values
     return values
 
-def fuzzy_match(value, valid_options, cutoff=0.6):
+# Normalizador construído uma única vez, com os valores válidos do CSV
+_normalizer = None
+
+def get_normalizer():
     """
-    Faz um fuzzy match para encontrar o valor mais próximo em uma lista de opções válidas.
+    Retorna o normalizador de entradas de projeto, criando-o na primeira chamada.
     """
-    if not isinstance(value, str):
-        return None
-    value = value.strip().lower()
-    matches = difflib.get_close_matches(
-        value, [str(opt).strip().lower() for opt in valid_options], n=1, cutoff=cutoff
-    )
-    if matches:
-        for opt in valid_options:
-            if opt.strip().lower() == matches[0]:
-                return opt
-    return None
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = ProjectNormalizer(get_categorical_field_values())
+    return _normalizer
 
 def normalize_project_data(project_data):
     """
@@ -63,140 +57,92 @@ def normalize_project_data(project_data):
     - Converte textos com palavras extras (ex: 'meses', 'entregas') em números puros.
     - Valida e normaliza valores categóricos via fuzzy.
     """
-    import unicodedata
-
-    def strip_accents(text):
-        """Remove acentuação de um texto."""
-        if not isinstance(text, str):
-            return text
-        return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-
-    def find_original(raw_value, valid_options):
-        """Procura o valor original no CSV que corresponde ao match (sem acento)."""
-        for option in valid_options:
-            if strip_accents(option).lower() == strip_accents(raw_value).lower():
-                return option
-        return None
-
-    # Normaliza duração
-    dur = project_data.get('duracao_meses', '')
-    if isinstance(dur, str):
-        dur = dur.lower().replace('meses', '').replace('mês', '').strip()
-    try:
-        project_data['duracao_meses'] = int(float(dur))
-    except Exception:
-        project_data.pop('duracao_meses', None)
-
-    # Normaliza orçamento, detecta mil, milhão, k
-    orc = str(project_data.get('orcamento', '')).lower().replace('r$', '').replace('reais', '').strip()
-    mult = 1
-    if 'milhao' in strip_accents(orc) or 'milhões' in strip_accents(orc):
-        mult = 1_000_000
-        orc = orc.replace('milhao', '').replace('milhoes', '').strip()
-    elif 'mil' in orc:
-        mult = 1_000
-        orc = orc.replace('mil', '').strip()
-    elif 'k' in orc:
-        mult = 1_000
-        orc = orc.replace('k', '').strip()
-    match = re.search(r'\d+[\.,]?\d*', orc)
-    if match:
-        val = float(match.group(0).replace(',', '.')) * mult
-        project_data['orcamento'] = val
-    else:
-        project_data.pop('orcamento', None)
-
-    # Normaliza entregas
-    ent = project_data.get('entregas', '')
-    if isinstance(ent, str):
-        ent = ent.lower().replace('entregas', '').replace('entrega', '').strip()
-    try:
-        project_data['entregas'] = int(float(ent))
-    except Exception:
-        project_data.pop('entregas', None)
-
-    # Normaliza tamanho da equipe
-    eq = project_data.get('tamanho_equipe', '')
-    if isinstance(eq, str):
-        eq = eq.lower().replace('pessoas', '').replace('pessoa', '').replace('equipe', '').strip()
-    try:
-        project_data['tamanho_equipe'] = int(float(eq))
-    except Exception:
-        project_data.pop('tamanho_equipe', None)
-
-    # Normaliza recursos disponíveis
-    rec = project_data.get('recursos_disponiveis', '')
-    rec_map = {
-        'baixo': 0, 'baixa': 0, '0': 0, 'baixos': 0, 'baixas': 0, 'Baixo':0, 'Baixa':0, 'Baixos':0, 'Baixas': 0,
-        'medio': 1, 'médio': 1, 'média': 1, '1': 1, 'médios': 1, 'medios': 1, 'médias': 1, 'medias': 1, 'Médio': 1, 'Medio':1,
-        'Médios':1, 'Medios':1, 'Média':1, 'media':1, 'Media':1, 'Médias':1, 'Medias':1,
-        'alto': 2, 'alta': 2, '2': 2, 'altos': 2, 'altas': 2, 'Alto':2, 'Alta':2, 'Altos':2, "Altas":2
+    return get_normalizer().normalize(project_data)
+
+def normalize_projects(projects):
+    """
+    Normaliza vários projetos de uma vez (lista de dicionários ou DataFrame),
+    com operações vetorizadas. Retorna um DataFrame.
+    """
+    return get_normalizer().normalize_many(projects)
+
+def normalize_scenario_changes(changes):
+    """
+    Normaliza um cenário pedido pelo usuário (campo -> novo valor), com as
+    mesmas regras dos dados do projeto. Levanta ValueError se algum valor
+    não puder ser interpretado.
+    """
+    normalizer = get_normalizer()
+    parsers = {
+        'tamanho_equipe': normalizer.parse_quantity,
+        'duracao_meses': lambda v: normalizer.parse_quantity(v, DURATION_UNITS),
+        'orcamento': normalizer.parse_budget,
     }
-    try:
-        rec_int = int(rec)
-        if rec_int in [0, 1, 2]:
-            project_data['recursos_disponiveis'] = rec_int
-        else:
-            project_data.pop('recursos_disponiveis', None)
-    except (ValueError, TypeError):
-        rec_norm = strip_accents(str(rec).lower().strip())
-        if rec_norm in rec_map:
-            project_data['recursos_disponiveis'] = rec_map[rec_norm]
-        else:
-            project_data.pop('recursos_disponiveis', None)
-
-    # Validação fuzzy para campos categóricos
-    cat_values = get_categorical_field_values()
-    fuzzy_fields = ['tipo_projeto', 'departamento', 'complexidade', 'metodologia', 'risco']
-    project_data['__invalid_fields'] = {}
-
-    for field in fuzzy_fields:
-        val = project_data.get(field, None)
-        if not val or str(val).strip() == "":
-            project_data[field] = None
-            continue
-
-        match = fuzzy_match(val, cat_values[field])
-        if match:
-            original = find_original(match, cat_values[field])
-            project_data[field] = original if original else match
+    normalized = {}
+    for field, value in changes.items():
+        if field in parsers:
+            parsed = parsers[field](value)
+        elif field in normalizer.CATEGORICAL_FIELDS:
+            parsed = normalizer.match_category(field, value)
         else:
-            project_data['__invalid_fields'][field] = val
-            project_data[field] = None
+            raise ValueError(f"O campo '{field}' não pode ser simulado.")
+        if parsed is None:
+            raise ValueError(f"Valor inválido para {FIELD_LABELS.get(field, field)}: {value!r}")
+        normalized[field] = parsed
+    return normalized
 
-    return project_data
-
-def predict_project_success(project_data):
+def build_prediction_payload(project_data):
     """
-    Envia os dados do projeto para a API de previsão.
-    Calcula ano, mês e dia da semana baseado na data de início.
-    """
-    data_inicio = project_data.get('data_inicio')
-    if data_inicio:
-        try:
-            dt = datetime.strptime(data_inicio, '%d/%m/%Y')
-        except Exception:
-            dt = datetime.now()
-    else:
-        dt = datetime.now()
-
-    ano_inicio, mes_inicio, dia_semana = dt.year, dt.month, dt.isoweekday()
-
-    payload = {
-        'ano_inicio': ano_inicio,
-        'mes_inicio': mes_inicio,
-        'dia_semana': dia_semana,
+    Monta o payload esperado pela API a partir dos dados normalizados.
+    A data de início vai como foi informada: ano, mês e dia da semana são
+    derivados pela API com a mesma implementação usada no treinamento, e uma
+    data que ela não consiga interpretar é rejeitada em vez de virar hoje.
+    """
+    return {
+        k: v for k, v in project_data.items()
+        if k != '__invalid_fields' and v not in (None, '', [])
     }
 
-    for k, v in project_data.items():
-        if k not in ['data_inicio', '__invalid_fields'] and v not in (None, '', []):
-            payload[k] = v
+def _post_api(path, body, params=None):
+    """
+    Faz a chamada à API. Dados rejeitados pela validação (422) viram
+    ValueError com o detalhe da API, para o agente pedir a correção.
+    """
+    response = requests.post(f"{API_BASE_URL}{path}", json=body, params=params, timeout=10)
+    if response.status_code == 422:
+        raise ValueError(f"A API rejeitou os dados do projeto: {response.json().get('detail')}")
+    response.raise_for_status()
+    return response.json()
+
+def predict_project_success(project_data, explain=False):
+    """
+    Envia os dados do projeto para a API de previsão.
+    Com explain=True, a API também retorna a contribuição de cada campo.
+    """
+    payload = build_prediction_payload(project_data)
 
     print("[DEBUG] Payload final:", json.dumps(payload, indent=2, ensure_ascii=False))
 
-    response = requests.post(f"{API_BASE_URL}/predict", json=payload, timeout=10)
-    response.raise_for_status()
-    return response.json()
+    params = {'explain': 'true'} if explain else None
+    return _post_api("/predict", payload, params=params)
+
+def simulate_project_scenarios(project_data, variations=None, scenarios=None, top_n=5):
+    """
+    Envia o projeto base para a API de simulação de cenários, que avalia
+    todas as variações em uma única chamada ao modelo.
+    `variations` pode trazer grades específicas, por exemplo {'tamanho_equipe': [10]},
+    e `scenarios` combinações específicas, por exemplo [{'metodologia': 'Scrum'}].
+    Sem nenhum dos dois, a API explora todas as mudanças possíveis; com eles,
+    avalia apenas o que foi pedido.
+    """
+    body = {'projeto': build_prediction_payload(project_data), 'top_n': top_n}
+    for field, values in (variations or {}).items():
+        if values:
+            body[field] = values
+    if scenarios:
+        body['cenarios'] = [normalize_scenario_changes(changes) for changes in scenarios]
+
+    return _post_api("/predict/what-if", body)
 
 def get_missing_fields(project_data):
     """
@@ -252,3 +198,100 @@ def format_prediction_response(prediction, project_data):
 📊 Resultado: {'✅ SUCESSO' if sucesso else '❌ FRACASSO'} 📈 Probabilidade: {prob:.1%}
 """
 
+# Rótulos usados para descrever cenários e fatores da previsão
+FIELD_LABELS = {
+    'tamanho_equipe': 'Equipe',
+    'duracao_meses': 'Duração',
+    'orcamento': 'Orçamento',
+    'entregas': 'Entregas',
+    'recursos_disponiveis': 'Recursos',
+    'ano_inicio': 'Ano de início',
+    'mes_inicio': 'Mês de início',
+    'dia_semana': 'Dia da semana de início',
+    'tipo_projeto': 'Tipo',
+    'departamento': 'Departamento',
+    'complexidade': 'Complexidade',
+    'metodologia': 'Metodologia',
+    'risco': 'Risco',
+}
+
+def _format_scenario_value(field, value):
+    """Formata um valor de campo para exibição no ranking de cenários."""
+    if field == 'orcamento':
+        return f"R$ {float(value):,.2f}"
+    if field == 'tamanho_equipe':
+        return f"{value} pessoas"
+    if field == 'duracao_meses':
+        return f"{value} meses"
+    return str(value)
+
+def format_scenarios_response(scenarios, project_data):
+    """
+    Formata o ranking de cenários retornado pela API, mostrando
+    de qual valor para qual valor cada campo muda e o ganho obtido.
+    """
+    prob_base = scenarios['probabilidade_base']
+    lines = [
+        "🔎 Simulação de Cenários",
+        "",
+        f"Probabilidade atual: {prob_base:.1%} "
+        f"({'✅ SUCESSO' if scenarios['sucesso_base'] else '❌ FRACASSO'})",
+        f"Cenários avaliados: {scenarios['variacoes_avaliadas']}",
+        "",
+    ]
+
+    def describe(item):
+        return "; ".join(
+            f"{FIELD_LABELS.get(field, field)}: "
+            f"{_format_scenario_value(field, project_data.get(field))} → {_format_scenario_value(field, value)}"
+            for field, value in item['mudancas'].items()
+        )
+
+    requested = scenarios.get('solicitadas') or []
+    if requested:
+        lines.append("🎯 Cenários solicitados:")
+        for item in requested:
+            lines.append(
+                f"- {describe(item)} | {item['probabilidade_sucesso']:.1%} "
+                f"({item['ganho'] * 100:+.1f} p.p.){' ✅' if item['sucesso'] else ''}"
+            )
+        lines.append("")
+
+    # Cenários solicitados que também estão no ranking já foram mostrados acima
+    best = [item for item in scenarios['melhores'] if all(item['mudancas'] != r['mudancas'] for r in requested)]
+    if not best:
+        if not requested:
+            lines.append("Nenhuma das variações avaliadas aumenta a probabilidade de sucesso.")
+        return "\n".join(lines).rstrip()
+
+    lines.append("📈 Mudanças que mais aumentam a chance de sucesso:")
+    for i, item in enumerate(best, start=1):
+        lines.append(
+            f"{i}. {describe(item)} | {item['probabilidade_sucesso']:.1%} "
+            f"(+{item['ganho'] * 100:.1f} p.p.){' ✅' if item['sucesso'] else ''}"
+        )
+
+    return "\n".join(lines)
+
+def describe_prediction_drivers(prediction, top_n=3):
+    """
+    Resume quais campos mais aumentaram e mais reduziram a probabilidade
+    de sucesso, a partir das contribuições retornadas pela API.
+    Retorna string vazia se a previsão não veio com explicação.
+    """
+    contributions = prediction.get('contribuicoes')
+    if not contributions:
+        return ""
+
+    ranked = sorted(contributions.items(), key=lambda item: item[1])
+    negatives = [(f, c) for f, c in ranked[:top_n] if c < 0]
+    positives = [(f, c) for f, c in reversed(ranked[-top_n:]) if c > 0]
+
+    def fmt(items):
+        return ", ".join(f"{FIELD_LABELS.get(f, f)} ({c * 100:+.1f} p.p.)" for f, c in items) or "nenhum"
+
+    return (
+        f"Probabilidade média do modelo: {prediction['valor_base']:.1%}\n"
+        f"Fatores que mais aumentaram a chance de sucesso: {fmt(positives)}\n"
+        f"Fatores que mais reduziram a chance de sucesso: {fmt(negatives)}"
+    )
@@ -0,0 +1,136 @@
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+
+# Colunas numéricas e categóricas usadas pelo modelo (ordem do treinamento)
+NUMERIC_FEATURES = [
+    'duracao_meses', 'orcamento', 'entregas',
+    'tamanho_equipe', 'recursos_disponiveis',
+    'ano_inicio', 'mes_inicio', 'dia_semana'
+]
+
+CATEGORICAL_FEATURES = [
+    'tipo_projeto', 'departamento',
+    'complexidade', 'metodologia', 'risco'
+]
+
+FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+# Colunas derivadas da data de início
+DATE_FEATURES = ['ano_inicio', 'mes_inicio', 'dia_semana']
+
+# Colunas de um projeto bruto, como em projetos.csv (as de data vêm de data_inicio)
+RAW_FEATURES = [f for f in FEATURES if f not in DATE_FEATURES] + ['data_inicio']
+
+# Formato ISO (projetos.csv) e formato brasileiro (entrada do chatbot)
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y')
+
+
+def parse_date(value):
+    """
+    Converte a data de início de um único projeto, sem pandas.
+    Aceita date/datetime ou texto em 'AAAA-MM-DD' ou 'DD/MM/AAAA'.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        # Mesmos formatos, na mesma ordem, que derive_date_features
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                pass
+    raise ValueError(f"Data de início inválida: {value!r}")
+
+
+def date_features(value):
+    """
+    Retorna (ano, mês, dia da semana) de uma data de início.
+    O dia da semana vai de 0 (segunda) a 6 (domingo), como no treinamento.
+    """
+    dt = parse_date(value)
+    return dt.year, dt.month, dt.weekday()
+
+
+def record_features(record):
+    """
+    Monta as features de um único projeto como dicionário, sem pandas.
+    Se o registro tiver data_inicio, ano, mês e dia da semana são derivados dela;
+    caso contrário, precisam vir preenchidos no próprio registro.
+    """
+    row = {f: record.get(f) for f in FEATURES}
+    if record.get('data_inicio') not in (None, ''):
+        row['ano_inicio'], row['mes_inicio'], row['dia_semana'] = date_features(record['data_inicio'])
+
+    missing = [f for f in FEATURES if row[f] is None]
+    if missing:
+        raise ValueError(f"Campos ausentes: {missing}")
+    return row
+
+
+def derive_date_features(datas):
+    """
+    Deriva ano, mês e dia da semana de uma coluna de datas de forma vetorizada.
+    Tenta primeiro o formato ISO e só reprocessa as linhas que falharem no
+    formato brasileiro. Retorna um dicionário coluna -> array.
+    """
+    datas = datas if isinstance(datas, pd.Series) else pd.Series(np.asarray(datas))
+
+    if pd.api.types.is_datetime64_any_dtype(datas):
+        parsed = datas
+    else:
+        # Espaços nas pontas são ignorados, como em parse_date
+        try:
+            sem_espacos = datas.str.strip()
+        except AttributeError:
+            # Coluna com objetos date/datetime misturados
+            sem_espacos = datas.map(lambda v: v.strip() if isinstance(v, str) else v)
+        datas = sem_espacos.where(sem_espacos.notna(), datas)
+        parsed = pd.to_datetime(datas, format=DATE_FORMATS[0], errors='coerce')
+        for fmt in DATE_FORMATS[1:]:
+            falhas = parsed.isna()
+            if not falhas.any():
+                break
+            parsed = parsed.mask(falhas, pd.to_datetime(datas[falhas], format=fmt, errors='coerce'))
+
+    if parsed.isna().any():
+        invalidas = datas[parsed.isna()].head(3).tolist()
+        raise ValueError(f"Datas de início inválidas: {invalidas}")
+
+    return {
+        'ano_inicio': parsed.dt.year.to_numpy(),
+        'mes_inicio': parsed.dt.month.to_numpy(),
+        'dia_semana': parsed.dt.dayofweek.to_numpy(),
+    }
+
+
+def build_feature_frame(data):
+    """
+    Converte projetos brutos no DataFrame de entrada do modelo, com as
+    colunas em FEATURES. Usado no treinamento, na API e no scoring em lote.
+
+    Aceita:
+    - dict de um único projeto (valores escalares): caminho sem pandas até
+      o DataFrame final de uma linha;
+    - DataFrame ou dict de colunas (listas/arrays NumPy): caminho vetorizado.
+
+    Em todos os casos, se houver data_inicio, as colunas de data são derivadas dela.
+    """
+    if isinstance(data, dict) and not any(
+        isinstance(v, (list, tuple, np.ndarray, pd.Series)) for v in data.values()
+    ):
+        return pd.DataFrame([record_features(data)], columns=FEATURES)
+
+    columns = {f: data[f] for f in FEATURES if f in data}
+    if 'data_inicio' in data:
+        columns.update(derive_date_features(data['data_inicio']))
+
+    missing = [f for f in FEATURES if f not in columns]
+    if missing:
+        raise ValueError(f"Campos ausentes: {missing}")
+
+    index = data.index if isinstance(data, pd.DataFrame) else None
+    return pd.DataFrame({f: columns[f] for f in FEATURES}, index=index)
@@ -0,0 +1,176 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import joblib
+
+# Engenharia de variáveis compartilhada com o treinamento e a API
+try:
+    from ml_model.features import RAW_FEATURES, build_feature_frame
+except ImportError:
+    from features import RAW_FEATURES, build_feature_frame
+
+# Tipos fixos na leitura do CSV. Sem eles, cada chunk infere os próprios tipos
+# (uma coluna vazia no primeiro chunk vira float) e a saída muda de esquema no meio.
+# Colunas fora desta tabela são lidas como texto.
+INPUT_DTYPES = {
+    'duracao_meses': 'Int64',
+    'orcamento': 'float64',
+    'entregas': 'Int64',
+    'tamanho_equipe': 'Int64',
+    'recursos_disponiveis': 'Int64',
+    'sucesso': 'Int64',
+}
+
+# Modelo de cada processo de scoring, definido uma única vez no initializer
+_worker_model = None
+
+
+def _init_worker(model):
+    """
+    Inicializa o processo de scoring com o modelo já carregado.
+    Limita o Random Forest a uma thread para não disputar CPU com os outros processos.
+    """
+    global _worker_model
+    _worker_model = model
+    _worker_model.set_params(clf__n_jobs=1)
+
+
+def score_chunk(chunk):
+    """
+    Calcula a probabilidade de sucesso de um chunk de projetos brutos.
+    As colunas de data são derivadas de forma vetorizada para o chunk inteiro.
+    """
+    return _worker_model.predict_proba(build_feature_frame(chunk))[:, 1]
+
+
+class _PredictionWriter:
+    """
+    Escreve os chunks pontuados em CSV ou Parquet, conforme a extensão
+    do arquivo de saída, sem manter o resultado inteiro em memória.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.parquet = output_path.lower().endswith('.parquet')
+        self._writer = None
+        self._file = None
+
+    def write(self, chunk):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output_path, table.schema)
+            else:
+                # O esquema do arquivo é o do primeiro chunk
+                table = table.cast(self._writer.schema)
+            self._writer.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.output_path, 'w', newline='', encoding='utf-8')
+                chunk.to_csv(self._file, index=False)
+            else:
+                chunk.to_csv(self._file, index=False, header=False)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def discard(self):
+        """Fecha e remove a saída parcial de uma execução que falhou."""
+        self.close()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+
+def score_portfolio(input_path, output_path, model_path='ml_model/model.pkl',
+                    chunksize=50_000, workers=None):
+    """
+    Pontua um portfólio de projetos em CSV (esquema de projetos.csv).
+
+    Carrega o modelo uma única vez, lê o CSV em chunks, distribui os chunks
+    entre processos e grava probabilidade e classificação na saída, na mesma
+    ordem da entrada. No máximo 2 chunks por processo ficam em memória,
+    então o consumo não cresce com o tamanho do arquivo.
+    Se a entrada já tiver a coluna `sucesso`, ela é preservada como `sucesso_real`.
+    Se a execução falhar, o arquivo de saída parcial é removido.
+    """
+    bundle = joblib.load(model_path)
+    model, threshold = bundle['model'], bundle['threshold']
+    workers = workers or os.cpu_count() or 1
+
+    columns = pd.read_csv(input_path, nrows=0).columns
+    dtypes = {column: INPUT_DTYPES.get(column, 'string') for column in columns}
+    reader = pd.read_csv(input_path, chunksize=chunksize, dtype=dtypes)
+    writer = _PredictionWriter(output_path)
+    total_rows = 0
+    start = time.perf_counter()
+
+    def write_scored(chunk, proba):
+        nonlocal total_rows
+        chunk = chunk.rename(columns={'sucesso': 'sucesso_real'})
+        chunk['probabilidade_sucesso'] = np.round(proba, 4)
+        chunk['sucesso'] = (proba >= threshold).astype(np.int8)
+        writer.write(chunk)
+        total_rows += len(chunk)
+
+    try:
+        if workers == 1:
+            _init_worker(model)
+            for chunk in reader:
+                write_scored(chunk, score_chunk(chunk[RAW_FEATURES]))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model,)) as pool:
+                pending = deque()
+                for chunk in reader:
+                    pending.append((chunk, pool.submit(score_chunk, chunk[RAW_FEATURES])))
+                    # Limita os chunks em voo para manter a memória constante
+                    if len(pending) >= 2 * workers:
+                        done_chunk, future = pending.popleft()
+                        write_scored(done_chunk, future.result())
+                while pending:
+                    done_chunk, future = pending.popleft()
+                    write_scored(done_chunk, future.result())
+    except BaseException:
+        writer.discard()
+        raise
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    return total_rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pontua um portfólio de projetos em CSV com o modelo treinado."
+    )
+    parser.add_argument('--input', default='ml_model/data/projetos.csv',
+                        help="CSV de entrada no esquema de projetos.csv.")
+    parser.add_argument('--output', required=True,
+                        help="Arquivo de saída (.csv ou .parquet).")
+    parser.add_argument('--model', default='ml_model/model.pkl',
+                        help="Bundle com o pipeline e o threshold.")
+    parser.add_argument('--chunksize', type=int, default=50_000,
+                        help="Linhas por chunk.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Número de processos (padrão: número de CPUs).")
+    args = parser.parse_args()
+
+    rows, elapsed = score_portfolio(
+        args.input, args.output, model_path=args.model,
+        chunksize=args.chunksize, workers=args.workers
+    )
+    print(f"Projetos pontuados: {rows} em {elapsed:.2f}s ({rows / elapsed:,.0f} linhas/s)")
+    print(f"Previsões salvas em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,12 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import (accuracy_score, roc_auc_score, classification_report, confusion_matrix,precision_score, recall_score, f1_score)
 import joblib
 
+# Engenharia de variáveis compartilhada com a API e o scoring em lote
+try:
+    from ml_model.features import NUMERIC_FEATURES, CATEGORICAL_FEATURES, build_feature_frame
+except ImportError:
+    from features import NUMERIC_FEATURES, CATEGORICAL_FEATURES, build_feature_frame
+
 
 def train_model():
     """
@@ -19,28 +25,16 @@ def train_model():
 
     # Caminho fixo do arquivo de entrada
     data_path = 'ml_model/data/projetos.csv'
-    df = pd.read_csv(data_path, parse_dates=['data_inicio'])
+    df = pd.read_csv(data_path)
     print(f"Projetos carregados: {len(df)} linhas")
 
-    # Criação de colunas derivadas de data
-    df['ano_inicio'] = df['data_inicio'].dt.year
-    df['mes_inicio'] = df['data_inicio'].dt.month
-    df['dia_semana'] = df['data_inicio'].dt.dayofweek
-
     # Colunas numéricas e categóricas
-    numeric_features = [
-        'duracao_meses', 'orcamento', 'entregas',
-        'tamanho_equipe', 'recursos_disponiveis',
-        'ano_inicio', 'mes_inicio', 'dia_semana'
-    ]
-
-    categorical_features = [
-        'tipo_projeto', 'departamento',
-        'complexidade', 'metodologia', 'risco'
-    ]
+    numeric_features = NUMERIC_FEATURES
+    categorical_features = CATEGORICAL_FEATURES
 
+    # Criação de colunas derivadas de data (mesma implementação usada na API)
     target = 'sucesso'
-    X = df[numeric_features + categorical_features]
+    X = build_feature_frame(df)
     y = df[target]
 
     # Separar treino e teste